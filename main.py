@@ -1,10 +1,11 @@
 import tkinter as tk
 from tkinter import messagebox
-import random
 import networkx as nx
+import numpy as np
 import time
-import threading
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
 from ui.map_view import MapView
 from ui.control_panel import ControlPanel
 
@@ -15,6 +16,16 @@ from src.ai.genetic import GeneticTSP
 from src.ai.astar import AStarNavigator
 from src.core.map_manager import MapManager
 
+@lru_cache(maxsize=1)
+def _load_map_manager() -> MapManager:
+    """Download and enrich the map once per process; later apps reuse it."""
+    map_manager = MapManager()
+    map_manager.load_graph()
+    return map_manager
+
+class _AppClosing(Exception):
+    """Raised from a worker's progress callback to abandon its job once the window closes."""
+
 class LogisticsApp:
     def __init__(self, root):
         self.root = root
@@ -22,23 +33,43 @@ class LogisticsApp:
         self.root.geometry("1400x900") # Larger window for side-by-side
         self.running = True
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        # Long-lived workers for the background optimizations (one per button
+        # flow), instead of a new thread per click
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='logistics')
+        self._last_progress = 0.0  # time.monotonic() of the last progress message
 
         # State
         self.orders = []
         self.depot_pos = (2, 2)
         self.optimized_sequence = []
+        # (stops and fragility it was built for, GA stop-to-stop cost matrix),
+        # reused across solves of the same orders
+        self._cost_matrix: Optional[Tuple[Tuple, np.ndarray]] = None
+        # (start, end) -> legacy shortest-length path; survives
+        # resets since the map itself does not change between runs
+        self._legacy_segment_cache: Dict[Tuple[int, int], Optional[List[int]]] = {}
         
         # Map Loader
-        self.map_manager = MapManager()
-        self.graph = self.map_manager.load_graph()
+        self.map_manager = _load_map_manager()
+        self.graph = self.map_manager.graph
         
         # AI Engines
         self.fuzzy_engine = FuzzyPriority()
         self.neural_engine = NeuralPredictor()
         self.astar_engine = AStarNavigator(self.graph)
         
+        # Length of every (u, v) edge; lengths never change, so the table is
+        # built once
+        self._edge_length = {
+            (u, v): data.get('length', 0) for u, v, data in self.graph.edges(data=True)
+        }
+        # Blocked streets, for counting the blocks a legacy route runs through
+        self._blocked_edges = {
+            (u, v) for u, v, data in self.graph.edges(data=True) if data.get('road_block', False)
+        }
+        
         # Depot (Pick the first node or specific if known)
-        self.depot_node = list(self.graph.nodes())[0]
+        self.depot_node = next(iter(self.graph.nodes()))
         
         # Setup UI
         self.setup_ui()
@@ -68,6 +99,7 @@ class LogisticsApp:
     def reset_simulation(self, silent=False):
         self.orders = []
         self.optimized_sequence = []
+        self._cost_matrix = None
         self.control_panel.update_table(self.orders)
         self.map_view_legacy.draw_graph(self.graph, self.depot_node)
         self.map_view_smart.draw_graph(self.graph, self.depot_node)
@@ -84,15 +116,21 @@ class LogisticsApp:
 
         self.reset_simulation(silent=True)
         
-        for i in range(num_orders):
-            # Pick random node for order
-            try:
-                node_id = self.map_manager.get_random_node()
-                # Deadline (10-120min), Weight (1-30kg), VIP (0/1)
-                order = Order(i + 1, node_id, random.randint(10, 120), random.uniform(1, 30), random.choice([True, False]), random.choice([0, 1]))
-                self.orders.append(order)
-            except Exception as e:
-                print(f"Error generating order: {e}")
+        try:
+            # Draw every random field for all orders at once
+            # Pick random node for each order
+            node_ids = self.map_manager.get_random_nodes(num_orders)
+            # Deadline (10-120min), Weight (1-30kg), Fragile, VIP (0/1)
+            deadlines = np.random.randint(10, 121, size=num_orders).tolist()
+            weights = np.random.uniform(1, 30, size=num_orders).tolist()
+            fragile = (np.random.random(num_orders) < 0.5).tolist()
+            priority_classes = np.random.randint(0, 2, size=num_orders).tolist()
+            self.orders = [
+                Order(i + 1, node_ids[i], deadlines[i], weights[i], fragile[i], priority_classes[i])
+                for i in range(num_orders)
+            ]
+        except Exception as e:
+            print(f"Error generating order: {e}")
         
         self.control_panel.update_table(self.orders)
         self.map_view_legacy.draw_graph(self.graph, self.depot_node)
@@ -111,13 +149,12 @@ class LogisticsApp:
             return
 
         # Run in background thread to avoid blocking UI
-        thread = threading.Thread(target=self._run_comparison_thread, daemon=True)
-        thread.start()
+        self._executor.submit(self._run_comparison_thread)
     
     def _run_comparison_thread(self) -> None:
         """Background thread for route optimization (avoids UI freeze)."""
-        self.root.config(cursor="wait")
-        self.control_panel.update_results("Calculando rotas...")
+        self._post_to_ui(lambda: self.root.config(cursor="wait"))
+        self._post_to_ui(lambda: self.control_panel.update_results("Calculando rotas..."))
         
         try:
             # --- 1. RUN LEGACY CALCULATION ---
@@ -128,30 +165,37 @@ class LogisticsApp:
                 
             # --- 2. RUN SMART CALCULATION ---
             # Analyze orders
-            for order in self.orders:
-                dist = self.astar_engine.get_path_cost(
-                    self.depot_node, order.node_id, is_fragile=False
-                )
-                self.fuzzy_engine.calculate(order, dist if dist != float('inf') else 5000)
-                self.neural_engine.predict(order)
+            # One Dijkstra row for all orders; unreachable (inf) distances
+            # are clipped to the fuzzy universe's 5000 maximum
+            dists = self.astar_engine.get_cost_matrix(
+                [self.depot_node], [order.node_id for order in self.orders], is_fragile=False
+            )[0]
+            # One vectorized Mamdani pass for every order
+            self.fuzzy_engine.calculate_batch(self.orders, dists)
+            # ... and one forward pass of the risk network
+            self.neural_engine.predict_batch(self.orders)
             
             # Update UI from thread safely
-            self.root.after(0, lambda: self.control_panel.update_table(self.orders))
-            self.root.after(0, lambda: self.map_view_smart.draw_analyzed_orders(self.orders, self.graph))
+            self._post_to_ui(lambda: self.control_panel.update_table(self.orders))
+            self._post_to_ui(lambda: self.map_view_smart.draw_analyzed_orders(self.orders, self.graph))
 
             # Optimize with progress callback
             def update_progress(current_gen: int, total_gens: int) -> None:
                 progress_msg = f"Otimizando rotas... {current_gen}/{total_gens} gerações"
-                self.root.after(0, lambda: self.control_panel.update_results(progress_msg))
+                self._report_progress(progress_msg, done=current_gen == total_gens)
             
+            orders = self.orders
+            cost_key = self._cost_matrix_key(orders)
             ga = GeneticTSP(
-                self.orders, 
+                orders, 
                 self.depot_node, 
                 self.astar_engine, 
                 truck_capacity=30.0, 
                 generations=20,
-                progress_callback=update_progress
+                progress_callback=update_progress,
+                cost_matrix=self._cached_cost_matrix(cost_key)
             )
+            self._cost_matrix = (cost_key, ga.cost_matrix)
             self.optimized_sequence = ga.solve()
             
             # Navigate
@@ -161,15 +205,43 @@ class LogisticsApp:
                 smart_dist = self._calculate_smart_dist(smart_path)
 
             # --- 3. ANIMATE BOTH (on main thread) ---
-            self.root.after(0, lambda: self._animate_comparison(
+            self._post_to_ui(lambda: self._animate_comparison(
                 legacy_path, legacy_dist, smart_path, smart_dist
             ))
             
+        except _AppClosing:
+            pass
         except Exception as e:
             error_msg = f"Erro durante otimização: {str(e)}"
-            self.root.after(0, lambda: messagebox.showerror("Erro", error_msg))
+            self._post_to_ui(lambda: messagebox.showerror("Erro", error_msg))
         finally:
-            self.root.after(0, lambda: self.root.config(cursor=""))
+            self._post_to_ui(lambda: self.root.config(cursor=""))
+    
+    def _report_progress(self, message: str, done: bool = False) -> None:
+        """Show a progress message from a worker thread, at most ~10 times per second.
+        
+        Every message is a cross-thread Tk dispatch; intermediate ones are
+        dropped when they come faster than the user can read them, the final
+        one is always shown.
+        """
+        # Progress is reported every generation, so this is where a running
+        # job notices that the window was closed and gives up
+        if not self.running:
+            raise _AppClosing()
+        now = time.monotonic()
+        if not done and now - self._last_progress < 0.1:
+            return
+        self._last_progress = now
+        self._post_to_ui(lambda: self.control_panel.update_results(message))
+
+    def _post_to_ui(self, callback: Callable[[], None]) -> None:
+        """Run callback on the Tk thread, unless the window is closing."""
+        if not self.running:
+            return
+        try:
+            self.root.after(0, callback)
+        except (RuntimeError, tk.TclError):
+            pass  # The window was destroyed after the check
     
     def _animate_comparison(self, legacy_path: List[int], legacy_dist: float,
                            smart_path: List[int], smart_dist: float) -> None:
@@ -186,15 +258,9 @@ class LogisticsApp:
         
         # --- 4. SHOW RESULTS ---
         # Check if Legacy hit a block
-        legacy_valid = True
-        legacy_block_count = 0
-        if legacy_path:
-            for i in range(len(legacy_path)-1):
-                u, v = legacy_path[i], legacy_path[i+1]
-                d = self.graph.get_edge_data(u, v)[0]
-                if d.get('road_block', False):
-                    legacy_valid = False
-                    legacy_block_count += 1
+        blocked = self._blocked_edges
+        legacy_block_count = sum(edge in blocked for edge in zip(legacy_path, legacy_path[1:]))
+        legacy_valid = legacy_block_count == 0
 
         legacy_status = f"{legacy_dist/1000:.2f} km"
         if not legacy_valid:
@@ -231,38 +297,47 @@ class LogisticsApp:
         for i in range(len(stops) - 1):
             start = stops[i]
             end = stops[i+1]
+            path = self._legacy_segment(start, end)
+            if path is not None:
+                full_path_nodes.extend(path if i == 0 else path[1:])
+        return full_path_nodes
+
+    def _legacy_segment(self, start: int, end: int) -> Optional[List[int]]:
+        """Shortest-length path between two nodes (None if unreachable), cached."""
+        key = (start, end)
+        if key not in self._legacy_segment_cache:
             try:
                 # Naive shortest path (shortest distance), ignoring 'road_block' attribute
                 path = nx.shortest_path(self.graph, start, end, weight='length')
-                full_path_nodes.extend(path if i == 0 else path[1:])
             except nx.NetworkXNoPath:
-                pass
-        return full_path_nodes
+                path = None
+            self._legacy_segment_cache[key] = path
+        return self._legacy_segment_cache[key]
     
     def _calculate_path_length(self, nodes):
-        total_len = 0
-        for i in range(len(nodes)-1):
-            u, v = nodes[i], nodes[i+1]
-            # Use simple length
-            d = self.graph.get_edge_data(u, v)[0]
-            total_len += d.get('length', 0)
-        return total_len
+        # Use simple length: one flat dict lookup per consecutive node pair
+        edge_length = self._edge_length
+        return sum(edge_length[edge] for edge in zip(nodes, nodes[1:]))
 
     def _calculate_smart_path(self):
         stops = [self.depot_node] + [self.orders[i].node_id for i in self.optimized_sequence] + [self.depot_node]
-        full_path = []
-        for i in range(len(stops) - 1):
-            start = stops[i]
-            end = stops[i+1]
-            is_fragile = False
-            if i < len(self.optimized_sequence):
-                 idx = self.optimized_sequence[i]
-                 is_fragile = self.orders[idx].is_fragile
-            
-            path_segment = self.astar_engine.get_path(start, end, is_fragile=is_fragile)
-            if path_segment:
-                full_path.extend(path_segment if i == 0 else path_segment[1:])
-        return full_path
+        # Each leg uses the fragility of the order it drives to; the way back
+        # to the depot is never fragile
+        fragile_legs = [self.orders[i].is_fragile for i in self.optimized_sequence] + [False]
+        return self.astar_engine.get_route(stops, fragile_legs)
+
+    def _cost_matrix_key(self, orders: List[Order]) -> Tuple:
+        """What a GA cost matrix depends on: the stops and each order's fragility."""
+        return (self.depot_node,
+                tuple(order.node_id for order in orders),
+                tuple(order.is_fragile for order in orders))
+
+    def _cached_cost_matrix(self, key: Tuple) -> Optional[np.ndarray]:
+        """The cached GA cost matrix if it was built for key, else None (rebuild)."""
+        cached = self._cost_matrix
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        return None
 
     def _calculate_smart_dist(self, nodes):
         # Same util as legacy but maybe checks actual edge used
@@ -279,50 +354,62 @@ class LogisticsApp:
         # Trigger Step 2, 3, 4 individually? Or just run logic
         # For simplicity, map to the button flow
         self.step2_analyze()
-        self.step3_optimize()
-        self.step4_navigate()
+        # The GA runs in the background; navigate once its route is ready
+        self.step3_optimize(on_done=self.step4_navigate)
 
     def step2_analyze(self):
         # (Same logic as before, just updating Smart View)
         if not self.orders: return
-        for order in self.orders:
-            dist = self.astar_engine.get_path_cost(self.depot_node, order.node_id, is_fragile=False)
-            self.fuzzy_engine.calculate(order, dist)
-            self.neural_engine.predict(order)
+        # One Dijkstra row for all orders, then one fuzzy and one neural pass
+        dists = self.astar_engine.get_cost_matrix(
+            [self.depot_node], [order.node_id for order in self.orders], is_fragile=False
+        )[0]
+        self.fuzzy_engine.calculate_batch(self.orders, dists)
+        self.neural_engine.predict_batch(self.orders)
         self.control_panel.update_table(self.orders)
         self.map_view_smart.draw_analyzed_orders(self.orders, self.graph)
 
-    def step3_optimize(self):
-        """Optimize delivery route using Genetic Algorithm (runs in background thread)."""
+    def step3_optimize(self, on_done: Optional[Callable[[], None]] = None):
+        """Optimize delivery route using Genetic Algorithm (runs in background thread).
+        
+        Args:
+            on_done: Optional callback run on the main thread once the
+                optimized route has been drawn
+        """
         if not self.orders:
             return
         
-        thread = threading.Thread(target=self._optimize_thread, daemon=True)
-        thread.start()
+        self._executor.submit(self._optimize_thread, on_done)
     
-    def _optimize_thread(self) -> None:
+    def _optimize_thread(self, on_done: Optional[Callable[[], None]] = None) -> None:
         """Background thread for route optimization."""
         try:
             def update_progress(current_gen: int, total_gens: int) -> None:
                 msg = f"Otimizando... {current_gen}/{total_gens} gerações"
-                self.root.after(0, lambda: self.control_panel.update_results(msg))
+                self._report_progress(msg, done=current_gen == total_gens)
             
+            orders = self.orders
+            cost_key = self._cost_matrix_key(orders)
             ga = GeneticTSP(
-                self.orders, 
+                orders, 
                 self.depot_node, 
                 self.astar_engine,
-                progress_callback=update_progress
+                progress_callback=update_progress,
+                cost_matrix=self._cached_cost_matrix(cost_key)
             )
+            self._cost_matrix = (cost_key, ga.cost_matrix)
             self.optimized_sequence = ga.solve()
             
             # Update UI on main thread
-            self.root.after(0, self._update_optimized_route)
+            self._post_to_ui(lambda: self._update_optimized_route(on_done))
             
+        except _AppClosing:
+            pass
         except Exception as e:
             error_msg = f"Erro na otimização: {str(e)}"
-            self.root.after(0, lambda: messagebox.showerror("Erro", error_msg))
+            self._post_to_ui(lambda: messagebox.showerror("Erro", error_msg))
     
-    def _update_optimized_route(self) -> None:
+    def _update_optimized_route(self, on_done: Optional[Callable[[], None]] = None) -> None:
         """Update UI with optimized route (must run on main thread)."""
         self.map_view_smart.draw_analyzed_orders(self.orders, self.graph)
         route_nodes = [self.depot_node] + \
@@ -330,6 +417,8 @@ class LogisticsApp:
                      [self.depot_node]
         self.map_view_smart.draw_optimized_route(route_nodes, self.graph)
         self.control_panel.update_results("Otimização concluída!")
+        if on_done:
+            on_done()
         
     def step4_navigate(self):
         path = self._calculate_smart_path()
@@ -338,7 +427,11 @@ class LogisticsApp:
              self.map_view_smart.animate_route(path, self.graph, lambda: messagebox.showinfo("Smart", f"Dist: {d/1000:.2f}km"))
 
     def on_close(self):
+        # Workers stop touching Tk from here on, and a running GA gives up at
+        # its next progress report, so exiting does not wait for it
         self.running = False
+        # Drop queued work
+        self._executor.shutdown(wait=False, cancel_futures=True)
         self.root.destroy()
         import sys
         sys.exit(0)
@@ -1,7 +1,34 @@
 from typing import List, Tuple
 import networkx as nx
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components, dijkstra
+import heapq
 import math
 
+
+def _edge_weight(d: dict, is_fragile: bool) -> float:
+    """Travel cost of a single edge given its attributes and the cargo type."""
+    # 1. Road Block Check
+    if d.get('road_block', False):
+        return float('inf')
+
+    # 2. Pavement Quality & Fragility
+    pavement_penalty = 1.0
+    if d.get('pavement_quality') == 'bad':
+        if is_fragile:
+            return float('inf')  # Fragile cargo cannot go on bad pavement
+        pavement_penalty = 1.4  # 40% slower
+
+    # 3. Traffic
+    traffic_factor = 1.0 + d.get('traffic_level', 0.0)
+
+    # Base travel time
+    travel_time = d.get('travel_time', 1.0)
+
+    return travel_time * pavement_penalty * traffic_factor
+
+
 class AStarNavigator:
     """Navigator using A* algorithm with real-world constraints.
     
@@ -17,28 +44,166 @@ class AStarNavigator:
         """
         self.graph = graph
 
-    def _heuristic(self, u: int, v: int) -> float:
-        """Calculate Euclidean distance between two nodes.
+        # Dense integer ids let the search loop work on flat lists
+        self._nodes = list(graph.nodes())
+        self._index = {node: i for i, node in enumerate(self._nodes)}
+        self._xs, self._ys = self._node_coordinates()
+        self._adjacency = {}  # is_fragile -> adjacency lists, built on first use
+        self._csr = {}  # is_fragile -> sparse cost matrix, built on first use
+        self._components = {}  # is_fragile -> weak component label of every node
+        # (source index, is_fragile) -> (costs, predecessors) to every node
+        self._shortest_path_trees = {}
+
+    def _node_coordinates(self) -> Tuple[List[float], List[float]]:
+        """Collect node coordinates into flat lists indexed by dense node id.
+        
+        The search loop reads positions from these lists instead of going
+        through the graph's node attribute dicts for every pushed node.
+        
+        Returns:
+            Tuple (xs, ys); all zeros (no heuristic) if any node lacks coordinates
+        """
+        try:
+            xs = [float(self.graph.nodes[node]['x']) for node in self._nodes]
+            ys = [float(self.graph.nodes[node]['y']) for node in self._nodes]
+        except (KeyError, TypeError, ValueError):
+            xs = ys = [0.0] * len(self._nodes)
+        return xs, ys
+
+    def _get_adjacency(self, is_fragile: bool) -> List[List[Tuple[int, float]]]:
+        """Return per-node lists of (neighbor index, edge cost) for a cargo type.
+        
+        Edge costs are evaluated once per graph instead of on every relaxation.
+        Impassable edges are left out and parallel edges collapse to the cheapest.
         
         Args:
-            u: Source node ID
-            v: Target node ID
+            is_fragile: Whether cargo is fragile (avoids bad pavement)
             
         Returns:
-            Euclidean distance between nodes (admissible heuristic for A*)
+            Adjacency lists indexed by dense node id
         """
-        try:
-            # Get node positions (OSMnx uses 'x' and 'y' attributes)
-            pos_u = (self.graph.nodes[u]['x'], self.graph.nodes[u]['y'])
-            pos_v = (self.graph.nodes[v]['x'], self.graph.nodes[v]['y'])
+        adjacency = self._adjacency.get(is_fragile)
+        if adjacency is not None:
+            return adjacency
+
+        is_multigraph = self.graph.is_multigraph()
+        adjacency = []
+        for u in self._nodes:
+            best = {}
+            for v, edge_data in self.graph.adj[u].items():
+                if is_multigraph:
+                    cost = min(_edge_weight(d, is_fragile) for d in edge_data.values())
+                else:
+                    cost = _edge_weight(edge_data, is_fragile)
+                if cost != float('inf'):
+                    best[self._index[v]] = cost
+            adjacency.append(list(best.items()))
+
+        self._adjacency[is_fragile] = adjacency
+        return adjacency
+
+    def _get_csr(self, is_fragile: bool) -> csr_matrix:
+        """Return the edge costs for a cargo type as a sparse (CSR) matrix.
+        
+        Args:
+            is_fragile: Whether cargo is fragile (avoids bad pavement)
             
-            # Calculate Euclidean distance
-            dx = pos_u[0] - pos_v[0]
-            dy = pos_u[1] - pos_v[1]
-            return math.sqrt(dx * dx + dy * dy)
-        except (KeyError, TypeError):
-            # Fallback to 0 if coordinates are missing
-            return 0.0
+        Returns:
+            Square matrix where entry [i, j] is the cost of edge i -> j
+        """
+        matrix = self._csr.get(is_fragile)
+        if matrix is None:
+            adjacency = self._get_adjacency(is_fragile)
+            rows = [u for u, edges in enumerate(adjacency) for _ in edges]
+            cols = [v for edges in adjacency for v, _ in edges]
+            costs = [cost for edges in adjacency for _, cost in edges]
+            n_nodes = len(self._nodes)
+            matrix = csr_matrix((costs, (rows, cols)), shape=(n_nodes, n_nodes))
+            self._csr[is_fragile] = matrix
+        return matrix
+
+    def _get_components(self, is_fragile: bool) -> np.ndarray:
+        """Return the weakly connected component label of every node.
+        
+        Nodes in different weak components can never reach each other, which
+        settles a query without searching the whole reachable area first.
+        
+        Args:
+            is_fragile: Whether cargo is fragile (avoids bad pavement)
+            
+        Returns:
+            Array of component labels indexed by dense node id
+        """
+        labels = self._components.get(is_fragile)
+        if labels is None:
+            _, labels = connected_components(self._get_csr(is_fragile), directed=True, connection='weak')
+            self._components[is_fragile] = labels
+        return labels
+
+    def _get_shortest_path_tree(self, source: int, is_fragile: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the shortest-path tree rooted at a node, computing it on first use.
+        
+        One compiled Dijkstra run over the CSR matrix yields the cost of and the
+        predecessor towards every node, so the result is memoized per source:
+        later queries from the same node are plain lookups.
+        
+        Args:
+            source: Dense index of the source node
+            is_fragile: Whether cargo is fragile (avoids bad pavement)
+            
+        Returns:
+            Tuple (costs, predecessors); unreachable nodes have cost inf
+        """
+        key = (source, is_fragile)
+        tree = self._shortest_path_trees.get(key)
+        if tree is None:
+            tree = dijkstra(self._get_csr(is_fragile), indices=source, return_predecessors=True)
+            self._shortest_path_trees[key] = tree
+        return tree
+
+    def _compute_shortest_path_trees(self, sources: List[int], is_fragile: bool) -> None:
+        """Compute the shortest-path trees of several sources in one Dijkstra call.
+        
+        SciPy runs the searches back to back in C; each row of the result is
+        memoized like a tree from _get_shortest_path_tree.
+        
+        Args:
+            sources: Dense indices of the source nodes
+            is_fragile: Whether cargo is fragile (avoids bad pavement)
+        """
+        missing = list(dict.fromkeys(
+            source for source in sources if (source, is_fragile) not in self._shortest_path_trees
+        ))
+        if not missing:
+            return
+        costs, predecessors = dijkstra(
+            self._get_csr(is_fragile), indices=missing, return_predecessors=True
+        )
+        for row, source in enumerate(missing):
+            self._shortest_path_trees[(source, is_fragile)] = (costs[row], predecessors[row])
+
+    def _walk_tree(self, start: int, end: int, is_fragile: bool) -> List[int]:
+        """Read the optimal path out of a memoized shortest-path tree.
+        
+        Args:
+            start: Dense index of the tree's source node
+            end: Dense index of the destination node
+            is_fragile: Cargo type the tree was computed for
+            
+        Returns:
+            List of node IDs from start to end, or empty list if unreachable
+        """
+        nodes = self._nodes
+        costs, predecessors = self._shortest_path_trees[(start, is_fragile)]
+        if costs[end] == float('inf'):
+            return []
+        path = [nodes[end]]
+        current = end
+        while current != start:
+            current = predecessors[current]
+            path.append(nodes[current])
+        path.reverse()
+        return path
 
     def get_path(self, start_node: int, end_node: int, is_fragile: bool = False) -> List[int]:
         """Find the optimal path between two nodes considering constraints.
@@ -51,40 +216,106 @@ class AStarNavigator:
         Returns:
             List of node IDs forming the optimal path, or empty list if no path exists
         """
-        def weight_function(u, v, d):
-            # 1. Road Block Check
-            if d.get('road_block', False):
-                return float('inf')
-
-            # 2. Pavement Quality & Fragility
-            pavement_penalty = 1.0
-            if d.get('pavement_quality') == 'bad':
-                if is_fragile:
-                    return float('inf')  # Fragile cargo cannot go on bad pavement
-                pavement_penalty = 1.4  # 40% slower
-
-            # 3. Traffic
-            traffic_factor = 1.0 + d.get('traffic_level', 0.0)
-
-            # Base travel time
-            travel_time = d.get('travel_time', 1.0)
-            
-            return travel_time * pavement_penalty * traffic_factor
+        if start_node not in self._index or end_node not in self._index:
+            print(f"Pathfinding error: node {start_node} or {end_node} not in graph")
+            return []
 
-        try:
-            return nx.astar_path(
-                self.graph, 
-                start_node, 
-                end_node,
-                heuristic=self._heuristic,
-                weight=weight_function
-            )
-        except nx.NetworkXNoPath:
+        nodes = self._nodes
+        start = self._index[start_node]
+        end = self._index[end_node]
+
+        # A Dijkstra tree already computed from this node (e.g. while building
+        # the GA cost matrix) holds the optimal path: just walk it back
+        if (start, is_fragile) in self._shortest_path_trees:
+            return self._walk_tree(start, end, is_fragile)
+
+        # Different components: no path, and A* would have to exhaust every
+        # node reachable from the start before giving up
+        components = self._get_components(is_fragile)
+        if components[start] != components[end]:
             return []
-        except Exception as e:
-            print(f"Pathfinding error: {e}")
+
+        adjacency = self._get_adjacency(is_fragile)
+
+        # Euclidean heuristic towards the target, computed inline from the
+        # flat coordinate lists
+        xs, ys = self._xs, self._ys
+        target_x, target_y = xs[end], ys[end]
+        hypot = math.hypot
+        heappop, heappush = heapq.heappop, heapq.heappush
+
+        n_nodes = len(nodes)
+        g_score = [float('inf')] * n_nodes
+        came_from = [-1] * n_nodes
+        closed = bytearray(n_nodes)
+        g_score[start] = 0.0
+
+        # Entries are (f_score, node index): ties fall back to comparing two
+        # ints, so no tie-breaking counter is needed. The start entry is
+        # popped first whatever its f_score
+        open_list = [(0.0, start)]
+
+        while open_list:
+            _, current = heappop(open_list)
+            if current == end:
+                path = [nodes[current]]
+                while current != start:
+                    current = came_from[current]
+                    path.append(nodes[current])
+                path.reverse()
+                return path
+
+            # Lazy deletion: stale heap entries of an expanded node are skipped
+            if closed[current]:
+                continue
+            closed[current] = 1
+
+            current_g = g_score[current]
+            for neighbor, cost in adjacency[current]:
+                if closed[neighbor]:
+                    continue
+                tentative_g = current_g + cost
+                if tentative_g < g_score[neighbor]:
+                    g_score[neighbor] = tentative_g
+                    came_from[neighbor] = current
+                    f_score = tentative_g + hypot(xs[neighbor] - target_x, ys[neighbor] - target_y)
+                    heappush(open_list, (f_score, neighbor))
+
+        return []
+
+    def get_route(self, waypoints: List[int], is_fragile: List[bool]) -> List[int]:
+        """Join the optimal paths between consecutive waypoints into one route.
+        
+        The shortest-path trees of all leg sources are computed up front, in
+        one batched Dijkstra call per cargo type, and each leg is then read
+        out of its tree.
+        
+        Args:
+            waypoints: Node IDs to visit in order
+            is_fragile: Cargo fragility of each leg (len(waypoints) - 1 flags)
+            
+        Returns:
+            List of node IDs; legs with no valid path are left out
+        """
+        unknown = [node for node in waypoints if node not in self._index]
+        if unknown:
+            print(f"Pathfinding error: nodes {unknown} not in graph")
             return []
 
+        stops = [self._index[node] for node in waypoints]
+        legs = list(zip(stops[:-1], stops[1:], is_fragile))
+        for fragile in set(is_fragile):
+            self._compute_shortest_path_trees(
+                [start for start, _, leg_fragile in legs if leg_fragile == fragile], fragile
+            )
+
+        route = []
+        for start, end, fragile in legs:
+            path = self._walk_tree(start, end, fragile)
+            if path:
+                route.extend(path if not route else path[1:])
+        return route
+
     def get_path_cost(self, start_node: int, end_node: int, is_fragile: bool = False) -> float:
         """Calculate the cost of the optimal path between two nodes.
         
@@ -96,32 +327,37 @@ class AStarNavigator:
         Returns:
             Total cost of the path, or infinity if no valid path exists
         """
-        def weight_function(u, v, d):
-            # Same logic as in get_path for consistency
-            if d.get('road_block', False):
-                return float('inf')
-
-            pavement_penalty = 1.0
-            if d.get('pavement_quality') == 'bad':
-                if is_fragile:
-                    return float('inf')
-                pavement_penalty = 1.4
-
-            traffic_factor = 1.0 + d.get('traffic_level', 0.0)
-            travel_time = d.get('travel_time', 1.0)
-            
-            return travel_time * pavement_penalty * traffic_factor
-        
-        try:
-            # Use NetworkX's efficient shortest_path_length
-            return nx.shortest_path_length(
-                self.graph,
-                start_node,
-                end_node,
-                weight=weight_function
-            )
-        except nx.NetworkXNoPath:
-            return float('inf')
-        except Exception as e:
-            print(f"Path cost calculation error: {e}")
+        if start_node not in self._index or end_node not in self._index:
+            print(f"Path cost calculation error: node {start_node} or {end_node} not in graph")
             return float('inf')
+
+        # Compiled Dijkstra over the CSR matrix, memoized per source node
+        distances, _ = self._get_shortest_path_tree(self._index[start_node], is_fragile)
+        return float(distances[self._index[end_node]])
+
+    def get_cost_matrix(self, sources: List[int], targets: List[int], is_fragile: bool = False) -> np.ndarray:
+        """Calculate optimal path costs from every source to every target.
+        
+        Args:
+            sources: Starting node IDs (matrix rows)
+            targets: Destination node IDs (matrix columns)
+            is_fragile: Whether the cargo is fragile (affects route selection)
+            
+        Returns:
+            Matrix of path costs, infinity where no valid path exists
+        """
+        for node in set(sources) | set(targets):
+            if node not in self._index:
+                print(f"Path cost calculation error: node {node} not in graph")
+
+        matrix = np.full((len(sources), len(targets)), float('inf'))
+        rows = [i for i, node in enumerate(sources) if node in self._index]
+        cols = [j for j, node in enumerate(targets) if node in self._index]
+        source_indices = [self._index[sources[i]] for i in rows]
+        target_indices = [self._index[targets[j]] for j in cols]
+
+        self._compute_shortest_path_trees(source_indices, is_fragile)
+        for i, source in zip(rows, source_indices):
+            distances, _ = self._shortest_path_trees[(source, is_fragile)]
+            matrix[i, cols] = distances[target_indices]
+        return matrix
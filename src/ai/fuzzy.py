@@ -1,43 +1,90 @@
 import numpy as np
-import skfuzzy as fuzz
-from skfuzzy import control as ctrl
+
+from src.models.order_batch import OrderBatch
 
 class FuzzyPriority:
     def __init__(self):
-        # Antecedents
+        # Universes
         # Deadline: 0 to 120 minutes. Shorter is more urgent.
-        deadline = ctrl.Antecedent(np.arange(0, 121, 1), 'deadline')
+        self.deadline_range = (0.0, 120.0)
         # Distance: 0 to 5000 meters/units.
-        dist = ctrl.Antecedent(np.arange(0, 5001, 10), 'dist')
-        # Consequent: Priority (0 to 10)
-        priority = ctrl.Consequent(np.arange(0, 11, 1), 'priority')
-
-        # Membership Functions
-        deadline.automf(3, names=['short', 'medium', 'long'])
-        dist.automf(3, names=['close', 'medium', 'far'])
-        priority.automf(3, names=['low', 'medium', 'high'])
-
-        # Rules
-        # Short deadline OR Close distance -> High Priority
-        rule1 = ctrl.Rule(deadline['short'] | dist['close'], priority['high'])
-        # Medium deadline AND Medium distance -> Medium Priority
-        rule2 = ctrl.Rule(deadline['medium'] & dist['medium'], priority['medium'])
-        # Long deadline AND Far distance -> Low Priority
-        rule3 = ctrl.Rule(deadline['long'] & dist['far'], priority['low'])
-
-        self.control_system = ctrl.ControlSystem([rule1, rule2, rule3])
-        self.sim = ctrl.ControlSystemSimulation(self.control_system)
+        self.dist_range = (0.0, 5000.0)
+        # Priority (0 to 10), sampled at integer points
+        self.priority_universe = np.arange(0, 11, 1).astype(float)
+
+        # Membership Functions: three evenly split triangles per variable, as
+        # skfuzzy's automf(3) builds them -- deadline short/medium/long, dist
+        # close/medium/far, priority low/medium/high. The rules live in _infer
+
+    @staticmethod
+    def _triangle3(x, lo, hi):
+        """Memberships of x in the three automf(3) terms spanning [lo, hi]."""
+        x = np.clip(x, lo, hi)  # ControlSystemSimulation clips inputs to the universe
+        half = (hi - lo) / 2.0
+        low = np.clip((lo + half - x) / half, 0.0, 1.0)
+        medium = np.clip(1.0 - np.abs(x - lo - half) / half, 0.0, 1.0)
+        high = np.clip((x - lo - half) / half, 0.0, 1.0)
+        return low, medium, high
+
+    def _infer(self, deadlines, distances):
+        """Mamdani min/max inference with centroid defuzzification.
+
+        Rules:
+            1. Short deadline OR Close distance -> High Priority
+            2. Medium deadline AND Medium distance -> Medium Priority
+            3. Long deadline AND Far distance -> Low Priority
+
+        Reproduces skfuzzy's ControlSystem result: the aggregated output is
+        sampled on the priority universe plus the points where each term is
+        cut by its rule, and the centroid of that piecewise-linear curve is
+        taken exactly.
+        """
+        short, medium_deadline, long_deadline = self._triangle3(
+            np.asarray(deadlines, dtype=float), *self.deadline_range)
+        close, medium_dist, far = self._triangle3(
+            np.asarray(distances, dtype=float), *self.dist_range)
+
+        # Rule activations (OR -> max, AND -> min)
+        high_cut = np.fmax(short, close)[:, None]
+        medium_cut = np.fmin(medium_deadline, medium_dist)[:, None]
+        low_cut = np.fmin(long_deadline, far)[:, None]
+
+        lo, hi = self.priority_universe[0], self.priority_universe[-1]
+        half = (hi - lo) / 2.0
+        cut_points = np.hstack((
+            lo + half * (1.0 - low_cut),
+            lo + half * medium_cut,
+            hi - half * medium_cut,
+            lo + half * (1.0 + high_cut),
+        ))
+        universe = np.broadcast_to(self.priority_universe, (len(cut_points), len(self.priority_universe)))
+        x = np.sort(np.hstack((universe, cut_points)), axis=1)
+
+        low, medium, high = self._triangle3(x, lo, hi)
+        y = np.fmax(np.fmax(np.fmin(low, low_cut), np.fmin(medium, medium_cut)),
+                    np.fmin(high, high_cut))
+
+        # Exact area and first moment of each trapezoid between samples
+        x1, x2, y1, y2 = x[:, :-1], x[:, 1:], y[:, :-1], y[:, 1:]
+        width = x2 - x1
+        area = (0.5 * width * (y1 + y2)).sum(axis=1)
+        moment = (width / 6.0 * (y1 * (2.0 * x1 + x2) + y2 * (x1 + 2.0 * x2))).sum(axis=1)
+
+        # No rule fires -> empty output area; keep the 5.0 fallback
+        priorities = np.full(area.shape, 5.0)
+        np.divide(moment, area, out=priorities, where=area > 0)
+        return priorities
 
     def calculate(self, order, distance):
-        self.sim.input['deadline'] = min(order.deadline, 120)
-        self.sim.input['dist'] = min(distance, 5000)
-        
-        try:
-            self.sim.compute()
-            order.fuzzy_priority = self.sim.output['priority']
-        except Exception as e:
-            # Fallback if fuzzy inputs are out of bounds or other error
-            print(f"Fuzzy Error: {e}")
-            order.fuzzy_priority = 5.0
-            
+        order.fuzzy_priority = float(self._infer([order.deadline], [distance])[0])
         return order
+
+    def calculate_batch(self, orders, distances):
+        """Same as calculate(), for all orders in one vectorized inference."""
+        if not orders:
+            return orders
+        batch = OrderBatch.from_orders(orders)
+        priorities = self._infer(batch.deadline, distances)
+        for order, priority in zip(orders, priorities):
+            order.fuzzy_priority = float(priority)
+        return orders
@@ -1,5 +1,5 @@
 from typing import List, Callable, Optional
-import random
+import numpy as np
 
 class GeneticTSP:
     """Genetic Algorithm for solving Capacitated Vehicle Routing Problem (CVRP).
@@ -10,7 +10,9 @@ class GeneticTSP:
     
     def __init__(self, orders: List, depot_node: int, astar_engine, 
                  truck_capacity: float = 30.0, population_size: int = 50, 
-                 generations: int = 50, progress_callback: Optional[Callable[[int, int], None]] = None) -> None:
+                 generations: int = 25, progress_callback: Optional[Callable[[int, int], None]] = None,
+                 cost_matrix: Optional[np.ndarray] = None,
+                 seed: Optional[int] = None) -> None:
         """Initialize the Genetic Algorithm solver.
         
         Args:
@@ -21,6 +23,10 @@ class GeneticTSP:
             population_size: Number of individuals in each generation
             generations: Number of generations to evolve
             progress_callback: Optional callback function(current_gen, total_gens)
+            cost_matrix: Optional precomputed stop-to-stop costs, laid out as
+                _build_cost_matrix returns them (e.g. a previous solver's
+                cost_matrix for the same depot and orders)
+            seed: Optional seed for the solver's random generator
         """
         self.orders = orders
         self.depot_node = depot_node
@@ -28,73 +34,115 @@ class GeneticTSP:
         self.truck_capacity = truck_capacity
         self.population_size = population_size
         self.generations = generations
-        self.population = []
+        self.population = np.empty((0, len(orders)), dtype=np.int32)
         self.progress_callback = progress_callback
+        self.rng = np.random.default_rng(seed)
 
-    def _calculate_fitness(self, individual: List[int]) -> float:
-        """Calculate fitness score integrating travel cost and fuzzy priority.
+        # Stop 0 is the depot, stop i + 1 is self.orders[i]
+        self.stops = [depot_node] + [order.node_id for order in orders]
+        # Order attributes the fitness functions need, read once instead of per evaluation
+        self.weights = np.array([order.weight for order in orders], dtype=float)
+        self.priorities = np.array([getattr(order, 'fuzzy_priority', 5.0) for order in orders], dtype=float)
+        if cost_matrix is not None and np.shape(cost_matrix) != (len(self.stops), len(self.stops)):
+            raise ValueError(
+                f"cost_matrix has shape {np.shape(cost_matrix)}, expected "
+                f"{(len(self.stops), len(self.stops))} for {len(orders)} orders"
+            )
+        self.cost_matrix = cost_matrix if cost_matrix is not None else self._build_cost_matrix()
+        # Route (as int32 row bytes) -> fitness, shared by every generation of solve()
+        self.fitness_cache = {}
+
+    def _build_cost_matrix(self) -> np.ndarray:
+        """Precompute the travel cost between every pair of stops.
+        
+        Entry [i, j] is the cost of driving from stop i to stop j. Trips to an
+        order respect that order's fragility and trips to the depot never do,
+        which is exactly how the fitness function used to query the A* engine.
+        
+        Returns:
+            Square matrix of path costs (infinity where no path exists)
+        """
+        fragile = np.array([False] + [order.is_fragile for order in self.orders])
+        # All shortest-path searches for a cargo type run in a single batched call
+        matrix = self.astar_engine.get_cost_matrix(self.stops, self.stops, is_fragile=False)
+        if fragile.any():
+            fragile_costs = self.astar_engine.get_cost_matrix(self.stops, self.stops, is_fragile=True)
+            matrix[:, fragile] = fragile_costs[:, fragile]
+        np.fill_diagonal(matrix, 0.0)
+        return matrix
+
+    def _population_fitness(self, population: np.ndarray) -> np.ndarray:
+        """Calculate fitness scores integrating travel cost and fuzzy priority.
         
         The fitness function penalizes routes that deliver high-priority orders late.
         This integrates Fuzzy Logic output (order.fuzzy_priority) with the Genetic Algorithm,
         creating a truly intelligent system that considers both route efficiency and urgency.
+        Many routes are scored at once: the loop steps through route positions
+        while every arithmetic step runs across all routes as a NumPy array operation.
         
         Args:
-            individual: Sequence of order indices representing a route
+            population: Routes of equal length (sequences of order indices)
             
         Returns:
-            Fitness score (higher is better)
+            Array of fitness scores, one per route (higher is better)
         """
-        total_score = 0.0
-        current_node = self.depot_node
-        current_load = 0.0
-        current_time = 0.0  # Accumulated time for priority penalty calculation
-        
-        # Iterate through the sequence of orders
-        for order_index in individual:
-            order = self.orders[order_index]
-            
-            # Check capacity constraint
-            if current_load + order.weight > self.truck_capacity:
-                # Return to depot to unload
-                cost_to_depot = self.astar_engine.get_path_cost(
-                    current_node, self.depot_node, is_fragile=False
-                )
-                total_score += cost_to_depot
-                current_time += cost_to_depot
-                
-                current_node = self.depot_node
-                current_load = 0.0
-            
-            # Travel to order location
-            is_fragile_trip = order.is_fragile
-            travel_cost = self.astar_engine.get_path_cost(
-                current_node, order.node_id, is_fragile=is_fragile_trip
-            )
-            
-            # Update cumulative metrics
+        cost = self.cost_matrix
+        routes = np.array(population, dtype=np.intp)
+        stops = routes + 1
+        weights = self.weights[routes]
+        priority_factors = (self.priorities / 5.0)[routes]
+
+        n_routes = len(routes)
+        total_score = np.zeros(n_routes)
+        current_time = np.zeros(n_routes)  # Accumulated time for priority penalty calculation
+        current_load = np.zeros(n_routes)
+        current_stop = np.zeros(n_routes, dtype=np.intp)  # Depot
+
+        for position in range(routes.shape[1]):
+            # Routes over capacity return to the depot to unload first
+            unload = current_load + weights[:, position] > self.truck_capacity
+            cost_to_depot = np.where(unload, cost[current_stop, 0], 0.0)
+            total_score += cost_to_depot
+            current_time += cost_to_depot
+            current_stop[unload] = 0
+            current_load[unload] = 0.0
+
+            # Travel to order location (fragility already applied in the matrix)
+            travel_cost = cost[current_stop, stops[:, position]]
             total_score += travel_cost
             current_time += travel_cost
-            
+
             # ** FUZZY INTEGRATION: Priority-based penalty **
             # High-priority orders (fuzzy_priority near 10) get heavy penalties if delivered late
             # This encourages the GA to place urgent orders early in the route
-            priority_weight = getattr(order, 'fuzzy_priority', 5.0)
-            time_penalty = current_time * (priority_weight / 5.0)
+            time_penalty = current_time * priority_factors[:, position]
             total_score += time_penalty
-            
-            # Update state
-            current_node = order.node_id
-            current_load += order.weight
-            
+
+            current_stop = stops[:, position]
+            current_load += weights[:, position]
+
         # Return to depot at end
-        final_cost = self.astar_engine.get_path_cost(
-            current_node, self.depot_node, is_fragile=False
-        )
-        total_score += final_cost
+        total_score += cost[current_stop, 0]
         
         # Convert to fitness (minimize total_score)
         return 1.0 / (total_score + 1e-6)
 
+    def _score_population(self, population: np.ndarray) -> np.ndarray:
+        """Return the fitness of each route, scoring each distinct route only once.
+        
+        Routes not seen before are scored together in one vectorized pass;
+        children that reproduce an earlier route are looked up in the cache.
+        """
+        keys = [route.tobytes() for route in population]
+        first_row = {}
+        for row, key in enumerate(keys):
+            if key not in self.fitness_cache:
+                first_row.setdefault(key, row)
+        if first_row:
+            scores = self._population_fitness(population[list(first_row.values())])
+            self.fitness_cache.update(zip(first_row, scores.tolist()))
+        return np.array([self.fitness_cache[key] for key in keys])
+
     def solve(self) -> List[int]:
         """Execute the genetic algorithm to find optimal route.
         
@@ -104,20 +152,33 @@ class GeneticTSP:
         if not self.orders:
             return []
             
-        indices = list(range(len(self.orders)))
-        self.population = [random.sample(indices, len(indices)) for _ in range(self.population_size)]
+        # One contiguous int32 row per individual, each a random permutation
+        n_orders = len(self.orders)
+        self.population = self.rng.permuted(
+            np.tile(np.arange(n_orders, dtype=np.int32), (self.population_size, 1)), axis=1
+        )
+        # Each individual is scored once, when it is created; elites keep their score
+        fitness_scores = self._score_population(self.population)
         
         best_route = None
         max_fitness = -1.0
+        n_elites = min(2, self.population_size)
+        n_children = self.population_size - n_elites
 
         for generation in range(self.generations):
-            fitness_scores = [self._calculate_fitness(ind) for ind in self.population]
+            # Only the elites need ranking: partial sort, then order those few
+            elites = np.argpartition(-fitness_scores, n_elites - 1)[:n_elites]
+            elites = elites[np.argsort(-fitness_scores[elites], kind='stable')]
+            
+            # Polish the best individual with 2-opt local search
+            best = elites[0]
+            self.population[best], fitness_scores[best] = self._two_opt(self.population[best],
+                                                                        fitness_scores[best])
             
             # Track best
-            for i, score in enumerate(fitness_scores):
-                if score > max_fitness:
-                    max_fitness = score
-                    best_route = self.population[i]
+            if best_route is None or fitness_scores[elites[0]] > max_fitness:
+                max_fitness = fitness_scores[elites[0]]
+                best_route = self.population[elites[0]].tolist()
             
             # Report progress if callback provided
             if self.progress_callback:
@@ -125,48 +186,128 @@ class GeneticTSP:
             
             # Selection & Next Gen ...
             # Simplified standard GA
-            next_pop = []
             
             # Elitism (Top 2)
-            sorted_pop = [x for _, x in sorted(zip(fitness_scores, self.population), key=lambda pair: pair[0], reverse=True)]
-            next_pop.extend(sorted_pop[:2])
+            next_pop = np.empty_like(self.population)
+            next_pop[:n_elites] = self.population[elites]
             
-            while len(next_pop) < self.population_size:
-                p1 = self._tournament(self.population, fitness_scores)
-                p2 = self._tournament(self.population, fitness_scores)
-                child = self._crossover(p1, p2)
-                self._mutate(child)
-                next_pop.append(child)
+            # All random draws of a generation are made up front, in batches
+            parents1 = self.population[self._tournament(fitness_scores, n_children)]
+            parents2 = self.population[self._tournament(fitness_scores, n_children)]
+            starts, ends = self._random_cuts(n_children, n_orders)
+            for row in range(n_children):
+                next_pop[n_elites + row] = self._crossover(parents1[row], parents2[row],
+                                                           starts[row], ends[row])
+            self._mutate(next_pop[n_elites:])
                 
+            # Elites keep their scores; children are scored in one batch
+            fitness_scores = np.concatenate((fitness_scores[elites],
+                                             self._score_population(next_pop[n_elites:])))
             self.population = next_pop
             
         return best_route
 
-    def _tournament(self, pop: List[List[int]], scores: List[float], k: int = 3) -> List[int]:
-        """Tournament selection: pick best from k random individuals."""
-        selection_ix = random.sample(range(len(pop)), k)
-        best_ix = selection_ix[0]
-        for ix in selection_ix[1:]:
-            if scores[ix] > scores[best_ix]:
-                best_ix = ix
-        return pop[best_ix]
-
-    def _crossover(self, p1: List[int], p2: List[int]) -> List[int]:
-        """Order 1 Crossover operator for TSP-like problems."""
-        start, end = sorted(random.sample(range(len(p1)), 2))
-        child = [None] * len(p1)
+    def _two_opt(self, route: np.ndarray, fitness: float, max_moves: int = 100) -> tuple:
+        """Apply the best improving 2-opt move until no reversal helps.
+        
+        The fitness is not a plain sum of leg costs (depot returns and the time
+        penalty depend on everything before a stop), so the usual edge-swap
+        delta does not apply; instead every reversal of the route is scored
+        in one vectorized pass per move.
+        
+        Args:
+            route: Route to improve (order indices)
+            fitness: Fitness of route
+            max_moves: Maximum number of improving moves to apply
+            
+        Returns:
+            Tuple of (improved route, its fitness)
+        """
+        n = len(route)
+        if n < 2:
+            return route, fitness
+        # Row k of moves is the permutation reversing positions starts[k]..ends[k]
+        starts, ends = np.triu_indices(n, k=1)
+        positions = np.arange(n)
+        in_segment = (positions >= starts[:, None]) & (positions <= ends[:, None])
+        moves = np.where(in_segment, starts[:, None] + ends[:, None] - positions, positions)
+        
+        for _ in range(max_moves):
+            candidates = route[moves]
+            # NaN scores (e.g. inf cost times a zero priority) never count as improvements
+            scores = self._population_fitness(candidates)
+            scores = np.where(np.isfinite(scores), scores, -np.inf)
+            best = int(np.argmax(scores))
+            if scores[best] == -np.inf or (np.isfinite(fitness) and scores[best] <= fitness):
+                break
+            route, fitness = candidates[best], scores[best]
+        return route, fitness
+
+    def _random_cuts(self, count: int, length: int) -> tuple:
+        """Draw count pairs of distinct positions in a route, each sorted.
+        
+        Args:
+            count: Number of pairs to draw
+            length: Route length (routes shorter than 2 get (0, 0) pairs)
+            
+        Returns:
+            Tuple of (first positions, second positions) arrays
+        """
+        if length < 2:
+            zeros = np.zeros(count, dtype=np.intp)
+            return zeros, zeros
+        first = self.rng.integers(0, length, size=count)
+        second = self.rng.integers(0, length - 1, size=count)
+        second += second >= first  # Skip first, so the two always differ
+        return np.minimum(first, second), np.maximum(first, second)
+
+    def _tournament(self, scores: np.ndarray, count: int, k: int = 3) -> np.ndarray:
+        """Tournament selection: for each of count winners, pick the best of k random individuals.
+        
+        Returns:
+            Population indices of the winners
+        """
+        # k distinct contenders per tournament, as random.sample would draw
+        contenders = np.argpartition(self.rng.random((count, len(scores))), k - 1, axis=1)[:, :k]
+        winners = np.argmax(scores[contenders], axis=1)
+        return contenders[np.arange(count), winners]
+
+    def _crossover(self, p1: np.ndarray, p2: np.ndarray, start: int, end: int) -> np.ndarray:
+        """Order 1 Crossover operator for TSP-like problems, keeping p1[start:end]."""
+        child = np.empty_like(p1)
         child[start:end] = p1[start:end]
         
-        ptr = 0
-        for gene in p2:
-            if gene not in child[start:end]:
-                while child[ptr] is not None:
-                    ptr += 1
-                child[ptr] = gene
+        # Genes are order indices, so a flat mask gives O(1) membership checks
+        used = np.zeros(len(p1), dtype=bool)
+        used[p1[start:end]] = True
+        
+        # The other genes keep p2's order and fill the slots around the segment
+        rest = p2[~used[p2]]
+        child[:start] = rest[:start]
+        child[end:] = rest[start:]
         return child
 
-    def _mutate(self, indiv: List[int]) -> None:
-        """Swap mutation: randomly swap two positions with 10% probability."""
-        if random.random() < 0.1:
-            i, j = random.sample(range(len(indiv)), 2)
-            indiv[i], indiv[j] = indiv[j], indiv[i]
+    def _mutate(self, children: np.ndarray) -> None:
+        """Swap mutation (10% probability) followed by a 2-opt move (30% probability).
+        
+        The 2-opt move reverses a random segment of the route, which removes
+        crossing legs in one step and speeds up convergence. Every row of
+        children is mutated in place, with all random draws made at once.
+        """
+        count, length = children.shape
+        if length < 2:
+            return
+        rows = np.arange(count)
+        
+        swap = self.rng.random(count) < 0.1
+        i, j = self._random_cuts(count, length)
+        i, j, swap_rows = i[swap], j[swap], rows[swap]
+        children[swap_rows, i], children[swap_rows, j] = children[swap_rows, j], children[swap_rows, i]
+        
+        reverse = self.rng.random(count) < 0.3
+        i, k = self._random_cuts(count, length)
+        i, k, reverse_rows = i[reverse], k[reverse], rows[reverse]
+        positions = np.arange(length)
+        in_segment = (positions >= i[:, None]) & (positions <= k[:, None])
+        order = np.where(in_segment, i[:, None] + k[:, None] - positions, positions)
+        children[reverse_rows] = np.take_along_axis(children[reverse_rows], order, axis=1)
@@ -1,6 +1,8 @@
 import numpy as np
 from sklearn.neural_network import MLPClassifier
 
+from src.models.order_batch import OrderBatch
+
 class NeuralPredictor:
     def __init__(self):
         # Mock Training Data
@@ -16,19 +18,46 @@ class NeuralPredictor:
         self.clf = MLPClassifier(hidden_layer_sizes=(8, 4), max_iter=1000, random_state=42)
         self.clf.fit(X_train, y_train)
 
+        # Cache the trained weights: inference is a couple of small matmuls,
+        # cheaper than going through sklearn's per-call input validation
+        self.weights = [w.astype(np.float32) for w in self.clf.coefs_]
+        self.biases = [b.astype(np.float32) for b in self.clf.intercepts_]
+
+    def _forward(self, X):
+        # ReLU hidden layers + logistic output unit (sklearn's binary MLPClassifier)
+        h = X
+        for W, b in zip(self.weights[:-1], self.biases[:-1]):
+            h = np.maximum(h @ W + b, 0.0)
+        logits = h @ self.weights[-1] + self.biases[-1]
+        # Probability of class 1 (Late/High Risk)
+        return 1.0 / (1.0 + np.exp(-logits[:, 0]))
+
     def predict(self, order):
         # Ensure fuzzy_priority is calculated before calling this
-        features = [[order.weight, order.priority_class, order.fuzzy_priority]]
-        
+        self.predict_batch([order])
+        return order
+
+    def predict_batch(self, orders):
+        # One forward pass for all orders (predict + predict_proba used to run two per order)
+        if not orders:
+            return orders
+
+        batch = OrderBatch.from_orders(orders)
+        features = np.column_stack(
+            (batch.weight, batch.priority_class, batch.fuzzy_priority)
+        ).astype(np.float32)
+
         try:
-            pred_class = self.clf.predict(features)[0]
-            # Probabilities: [Prob(0), Prob(1)]
-            prob_risk = self.clf.predict_proba(features)[0][1]
-            
-            order.risk_level = "HIGH" if pred_class == 1 else "LOW"
-            # We could attach risk_prob to order if we wanted to
+            prob_risk = self._forward(features)
+            # Same decision rule as clf.predict: class 1 when Prob(1) > 0.5
+            pred_classes = self.clf.classes_[(prob_risk > 0.5).astype(int)]
+
+            for order, pred_class in zip(orders, pred_classes):
+                order.risk_level = "HIGH" if pred_class == 1 else "LOW"
+                # We could attach risk_prob to order if we wanted to
         except Exception as e:
             print(f"Neural Prediction Error: {e}")
-            order.risk_level = "UNKNOWN"
-            
-        return order
+            for order in orders:
+                order.risk_level = "UNKNOWN"
+
+        return orders
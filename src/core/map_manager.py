@@ -1,12 +1,14 @@
 import osmnx as ox
 import networkx as nx
-import random
+import numpy as np
 import os
 
 class MapManager:
     def __init__(self, place_name="Santa Rosa, Rio Grande do Sul, Brazil"):
         self.place_name = place_name
         self.graph = None
+        self._node_ids = None  # Node list of self.graph, for random sampling
+        self._node_ids_graph = None
         # Configure osmnx cache
         ox.settings.use_cache = True
         ox.settings.log_console = False
@@ -22,28 +24,71 @@ class MapManager:
         self.graph = ox.graph_from_point(point, dist=1000, network_type='drive')
 
         self._enrich_edges()
+        self._flatten_edges()
         print(f"Map loaded: {len(self.graph.nodes)} nodes, {len(self.graph.edges)} edges.")
         return self.graph
 
     def _enrich_edges(self):
         """Adds simulation attributes to edges."""
-        for u, v, k, data in self.graph.edges(keys=True, data=True):
-            # Traffic: 0.0 (None) to 1.0 (Heavy)
-            data['traffic_level'] = random.uniform(0.0, 1.0)
-            
-            # Pavement quality
-            data['pavement_quality'] = random.choice(['good', 'good', 'fair', 'bad'])
-            
-            # Road Block (Very Rare event)
-            # 0.2% chance of being blocked to avoid sealing off areas
-            data['road_block'] = random.random() < 0.002
+        edges = list(self.graph.edges(keys=True, data=True))
+        n_edges = len(edges)
+
+        # Draw each attribute for all edges at once
+        # Traffic: 0.0 (None) to 1.0 (Heavy)
+        traffic = np.random.uniform(0.0, 1.0, n_edges)
+
+        # Pavement quality
+        pavement = np.random.choice(['good', 'good', 'fair', 'bad'], n_edges)
+
+        # Road Block (Very Rare event)
+        # 0.2% chance of being blocked to avoid sealing off areas
+        road_block = np.random.random(n_edges) < 0.002
+
+        # tolist() hands back plain Python floats/strs/bools for the edge dicts
+        for (u, v, k, data), traffic_level, pavement_quality, blocked in zip(
+                edges, traffic.tolist(), pavement.tolist(), road_block.tolist()):
+            data['traffic_level'] = traffic_level
+            data['pavement_quality'] = pavement_quality
+            data['road_block'] = blocked
 
             # Store speed limit helper
             if 'maxspeed' not in data:
                 data['maxspeed'] = 40
 
-    def get_random_node(self):
-        """Returns a random node ID from the graph."""
+    def _get_node_ids(self):
+        """Returns the graph's node IDs as a list, built once per graph."""
         if not self.graph:
             raise ValueError("Graph not loaded. Call load_graph() first.")
-        return random.choice(list(self.graph.nodes()))
+        if self._node_ids_graph is not self.graph:
+            self._node_ids = list(self.graph.nodes())
+            self._node_ids_graph = self.graph
+        return self._node_ids
+
+    def _flatten_edges(self):
+        """Collapses parallel edges so the graph becomes a plain DiGraph.
+
+        OSMnx returns a MultiDiGraph, which made every edge lookup go through
+        get_edge_data(u, v)[0]. Where a street has parallel edges only the
+        shortest one is kept, i.e. the one a length-weighted route uses.
+        """
+        shortest = {}
+        for u, v, data in self.graph.edges(data=True):
+            current = shortest.get((u, v))
+            if current is None or data.get('length', float('inf')) < current.get('length', float('inf')):
+                shortest[(u, v)] = data
+
+        flat = nx.DiGraph()
+        flat.graph.update(self.graph.graph)
+        flat.add_nodes_from(self.graph.nodes(data=True))
+        flat.add_edges_from((u, v, data) for (u, v), data in shortest.items())
+        self.graph = flat
+
+    def get_random_node(self):
+        """Returns a random node ID from the graph."""
+        node_ids = self._get_node_ids()
+        return node_ids[np.random.randint(len(node_ids))]
+
+    def get_random_nodes(self, n):
+        """Returns n random node IDs (with repetition) from one NumPy draw."""
+        node_ids = self._get_node_ids()
+        return [node_ids[i] for i in np.random.randint(0, len(node_ids), size=n).tolist()]
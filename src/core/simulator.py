@@ -1,7 +1,8 @@
 import networkx as nx
-import random
+import numpy as np
 import time
 from copy import deepcopy
+from dataclasses import replace
 
 from src.core.map_manager import MapManager
 from src.models.order import Order
@@ -12,38 +13,53 @@ from src.ai.genetic import GeneticTSP
 from src.ai.astar import AStarNavigator
 
 class Simulator:
-    def __init__(self, num_orders=15, mode="smart"):
+    def __init__(self, num_orders=15, mode="smart", fuzzy=None, neural=None, map_manager=None, orders=None, astar=None):
         self.num_orders = num_orders
         self.mode = mode
         
-        # 1. Init Map
-        self.map_manager = MapManager()
-        self.graph = self.map_manager.load_graph()
-        self.astar = AStarNavigator(self.graph)
+        # 1. Init Map (pass an already loaded MapManager to share one
+        # downloaded and enriched graph across simulations)
+        if map_manager is None:
+            map_manager = MapManager()
+        if map_manager.graph is None:
+            map_manager.load_graph()
+        self.map_manager = map_manager
+        self.graph = map_manager.graph
+        # The navigator memoizes its shortest-path trees, so sharing one between
+        # the legacy and smart runs of a scenario reuses every search
+        self.astar = astar if astar is not None else AStarNavigator(self.graph)
         
         # 2. Init Models
         self.orders = []
-        self.depot_node = list(self.graph.nodes())[0] # Simplification
+        self.depot_node = next(iter(self.graph.nodes())) # Simplification
         self.truck = Truck(capacity=30.0)
         
-        # 3. Init AI
-        self.fuzzy = FuzzyPriority()
-        self.neural = NeuralPredictor()
+        # 3. Init AI (pass prebuilt models to share them across simulations;
+        # they are stateless once trained)
+        self.fuzzy = fuzzy if fuzzy is not None else FuzzyPriority()
+        self.neural = neural if neural is not None else NeuralPredictor()
         
-        # Generate random orders
-        self._generate_orders()
+        # Generate random orders, or take copies of a given set so that legacy
+        # and smart runs can be compared on the same orders without
+        # regenerating them (the AI steps write onto the orders)
+        if orders is not None:
+            self.orders = [replace(order) for order in orders]
+            self.num_orders = len(self.orders)
+        else:
+            self._generate_orders()
 
     def _generate_orders(self):
         print(f"Generating {self.num_orders} orders...")
+        # Every field comes from np.random, like the map and the app's orders,
+        # so seeding NumPy alone reproduces a scenario
+        node_ids = self.map_manager.get_random_nodes(self.num_orders)
+        # Random attributes
+        deadlines = np.random.randint(10, 121, size=self.num_orders).tolist()
+        weights = np.random.uniform(1.0, 15.0, size=self.num_orders).tolist()
+        fragile = (np.random.random(self.num_orders) < 0.5).tolist()
+        priority_classes = np.random.randint(0, 2, size=self.num_orders).tolist()
         for i in range(self.num_orders):
-            node_id = self.map_manager.get_random_node()
-            # Random attributes
-            deadline = random.randint(10, 120)
-            weight = random.uniform(1.0, 15.0)
-            is_fragile = random.choice([True, False])
-            priority_class = random.choice([0, 1])
-            
-            order = Order(i+1, node_id, deadline, weight, is_fragile, priority_class)
+            order = Order(i+1, node_ids[i], deadlines[i], weights[i], fragile[i], priority_classes[i])
             self.orders.append(order)
 
     def run(self):
@@ -52,6 +68,14 @@ class Simulator:
         else:
             return self._run_legacy()
 
+    def compare(self):
+        """Run both modes on this instance's map, orders and navigator.
+
+        Equivalent to two Simulators built from the same inputs, without
+        paying for the setup twice. Returns (legacy_result, smart_result).
+        """
+        return self._run_legacy(), self._run_smart()
+
     def _calculate_real_cost(self, path):
         """Calculates the actual time/cost taken to traverse a path, considering current conditions."""
         total_time = 0.0
@@ -59,7 +83,7 @@ class Simulator:
         
         for i in range(len(path) - 1):
             u, v = path[i], path[i+1]
-            data = self.graph.get_edge_data(u, v)[0]
+            data = self.graph.get_edge_data(u, v)
             
             # Real traversal physics
             
@@ -160,12 +184,13 @@ class Simulator:
         
         # 1. Fuzzy & Neural
         current_node = self.depot_node
-        for order in self.orders:
-            # Estimate distance for fuzzy (using air dist or prev known)
-            # Use A* cost from depot as approximation
-            dist = self.astar.get_path_cost(self.depot_node, order.node_id, is_fragile=False)
-            self.fuzzy.calculate(order, dist)
-            self.neural.predict(order)
+        # Estimate distance for fuzzy (using air dist or prev known)
+        # Use A* cost from depot as approximation: one Dijkstra for all orders
+        dists = self.astar.get_cost_matrix(
+            [self.depot_node], [order.node_id for order in self.orders], is_fragile=False
+        )[0]
+        self.fuzzy.calculate_batch(self.orders, dists)
+        self.neural.predict_batch(self.orders)
         
         # 2. Genetic Optimization
         print("Optimizing route (Genetic Algorithm)...")
@@ -208,7 +233,7 @@ class Simulator:
             # Approximate distance (just for stats)
             # path_weight using length
             for i in range(len(path)-1):
-                 d = self.graph.get_edge_data(path[i], path[i+1])[0]
+                 d = self.graph.get_edge_data(path[i], path[i+1])
                  total_dist += d.get('length', 0)
 
             self.truck.load(order.weight)
@@ -236,11 +261,8 @@ class Simulator:
 
         for i in range(len(path) - 1):
             u, v = path[i], path[i+1]
-            # Handle MultiDiGraph
-            all_edges = self.graph.get_edge_data(u, v)
-            # With A* or shortest_path, we assume the best edge was picked if multiples exist?
-            # Or we just take key=0
-            data = all_edges[0]
+            # MapManager flattens parallel edges, so there is one edge per (u, v)
+            data = self.graph.get_edge_data(u, v)
             
             length = data.get('length', 100)
             traffic = data.get('traffic_level', 0.0)
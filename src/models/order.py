@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import Optional
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     id: int
     node_id: int  # OSMnx Node ID
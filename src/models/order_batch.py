@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+from src.models.order import Order
+
+@dataclass(frozen=True, slots=True)
+class OrderBatch:
+    """Structure-of-arrays copy of a list of orders.
+    
+    Bulk AI passes (fuzzy priority, risk prediction) read whole columns
+    instead of one attribute per order object. It is a read-only snapshot:
+    results are written back to the Order objects.
+    """
+    node_id: np.ndarray  # int64, OSMnx Node IDs
+    deadline: np.ndarray  # float32, minutes
+    weight: np.ndarray  # float32, kg
+    is_fragile: np.ndarray  # bool
+    priority_class: np.ndarray  # int8, 0 (Normal) or 1 (VIP)
+    fuzzy_priority: np.ndarray  # float32
+
+    @classmethod
+    def from_orders(cls, orders: List[Order]) -> "OrderBatch":
+        return cls(
+            node_id=np.array([o.node_id for o in orders], dtype=np.int64),
+            deadline=np.array([o.deadline for o in orders], dtype=np.float32),
+            weight=np.array([o.weight for o in orders], dtype=np.float32),
+            is_fragile=np.array([o.is_fragile for o in orders], dtype=bool),
+            priority_class=np.array([o.priority_class for o in orders], dtype=np.int8),
+            fuzzy_priority=np.array([o.fuzzy_priority for o in orders], dtype=np.float32),
+        )
+
+    def __len__(self) -> int:
+        return len(self.node_id)
@@ -20,13 +20,30 @@ class MapView(tk.Frame):
         self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
         
         self.truck_marker = None
+        # (graph, depot) whose static layer is on the axes, and its artists
+        self._background_key = None
+        self._background_artists = set()
         
         # Legend (could be improved)
         # We will add legend when drawing the graph
 
     def draw_graph(self, graph, depot_node):
-        self.ax.clear()
         self.truck_marker = None
+
+        # Same map as last time: keep the static street layer and only remove
+        # what was drawn on top of it (orders, routes, truck) -- re-plotting
+        # every edge is what made resets slow. The draw_* methods only
+        # schedule a render (draw_idle), so a reset followed by new markers
+        # is painted once, not once per call
+        if self._background_key == (id(graph), depot_node):
+            for artist in list(self.ax.lines) + list(self.ax.texts):
+                if artist not in self._background_artists:
+                    artist.remove()
+            self.ax.set_title(self.map_title)
+            self.canvas.draw_idle()
+            return
+
+        self.ax.clear()
         
         # Draw edges
         for u, v, data in graph.edges(data=True):
@@ -61,35 +78,43 @@ class MapView(tk.Frame):
         self.ax.set_title(self.map_title)
         self.ax.axis('off')
         
-        self.canvas.draw()
+        self._background_key = (id(graph), depot_node)
+        self._background_artists = set(self.ax.lines) | set(self.ax.texts)
+        
+        self.canvas.draw_idle()
 
     def draw_orders(self, orders, graph):
-        for o in orders:
-            node = graph.nodes[o.node_id]
-            x, y = node['x'], node['y']
-            self.ax.plot(x, y, 'o', color='blue', markeredgecolor='white', markeredgewidth=1.5, markersize=8, zorder=20)
+        xs = [graph.nodes[o.node_id]['x'] for o in orders]
+        ys = [graph.nodes[o.node_id]['y'] for o in orders]
+        # All markers share one artist; only the labels need one each
+        self.ax.plot(xs, ys, 'o', color='blue', markeredgecolor='white', markeredgewidth=1.5, markersize=8, zorder=20)
+        for o, x, y in zip(orders, xs, ys):
             self.ax.text(x, y, f"P{o.id}", color="white", fontsize=8, fontweight='bold',
                          bbox=dict(facecolor='blue', edgecolor='white', boxstyle='round,pad=0.2', alpha=0.8), zorder=25)
-        self.canvas.draw()
+        self.canvas.draw_idle()
 
     def draw_analyzed_orders(self, orders, graph):
-        for o in orders:
-            node = graph.nodes[o.node_id]
-            x, y = node['x'], node['y']
-            color = 'red' if o.risk_level == "HIGH" else 'green'
-            self.ax.plot(x, y, marker='o', color=color, markeredgecolor='white', markeredgewidth=1.5, markersize=10, zorder=20)
+        xs = [graph.nodes[o.node_id]['x'] for o in orders]
+        ys = [graph.nodes[o.node_id]['y'] for o in orders]
+        colors = ['red' if o.risk_level == "HIGH" else 'green' for o in orders]
+        # One marker artist per risk color
+        for color in ('red', 'green'):
+            points = [(x, y) for x, y, c in zip(xs, ys, colors) if c == color]
+            if points:
+                px, py = zip(*points)
+                self.ax.plot(px, py, 'o', color=color, markeredgecolor='white', markeredgewidth=1.5, markersize=10, zorder=20)
+        for o, x, y, color in zip(orders, xs, ys, colors):
             self.ax.text(x, y, f"P{o.id}\nPri:{o.fuzzy_priority:.1f}", fontsize=7, color='white', fontweight='bold',
                          bbox=dict(facecolor=color, edgecolor='white', boxstyle='round,pad=0.2', alpha=0.8), zorder=25)
-        self.canvas.draw()
+        self.canvas.draw_idle()
         
     def draw_optimized_route(self, route_nodes, graph):
-        for i in range(len(route_nodes) - 1):
-            u = route_nodes[i]
-            v = route_nodes[i+1]
-            x1, y1 = graph.nodes[u]['x'], graph.nodes[u]['y']
-            x2, y2 = graph.nodes[v]['x'], graph.nodes[v]['y']
-            self.ax.plot([x1, x2], [y1, y2], 'k--', alpha=0.5, zorder=5)
-        self.canvas.draw()
+        # The legs form one polyline, drawn as a single artist
+        xs = [graph.nodes[n]['x'] for n in route_nodes]
+        ys = [graph.nodes[n]['y'] for n in route_nodes]
+        if len(route_nodes) > 1:
+            self.ax.plot(xs, ys, 'k--', alpha=0.5, zorder=5)
+        self.canvas.draw_idle()
 
     def animate_route(self, full_path_nodes, graph, on_animation_complete):
         self.ax.set_title("Animando Rota (Caminhão em Movimento)...")
@@ -104,29 +129,30 @@ class MapView(tk.Frame):
             self.truck_marker.remove()
             
         self.truck_marker, = self.ax.plot(sx, sy, marker='s', color='black', markerfacecolor='yellow', markeredgewidth=2, markersize=12, zorder=40)
+        # The trail is one line that grows each step instead of a new artist per segment
+        trail, = self.ax.plot([sx], [sy], linewidth=3, color="#0077be", solid_capstyle='round', zorder=30)
         
-        self.canvas.draw()
-        self._animate_segment(full_path_nodes, 0, graph, on_animation_complete)
+        self.canvas.draw_idle()
+        self._animate_segment(full_path_nodes, 0, graph, on_animation_complete, trail, [sx], [sy])
 
-    def _animate_segment(self, path_nodes, index, graph, on_animation_complete):
+    def _animate_segment(self, path_nodes, index, graph, on_animation_complete, trail, trail_x, trail_y):
         if index >= len(path_nodes) - 1:
             self.ax.set_title("Entrega Concluída!")
             if self.truck_marker:
                  # Check if we removed it? No, keep it at end pos
                  pass
-            self.canvas.draw()
+            self.canvas.draw_idle()
             if on_animation_complete:
                 on_animation_complete()
             return
 
-        u = path_nodes[index]
         v = path_nodes[index+1]
-        
-        x1, y1 = graph.nodes[u]['x'], graph.nodes[u]['y']
         x2, y2 = graph.nodes[v]['x'], graph.nodes[v]['y']
 
-        # Draw trail
-        self.ax.plot([x1, x2], [y1, y2], linewidth=3, color="#0077be", solid_capstyle='round', zorder=30)
+        # Extend trail
+        trail_x.append(x2)
+        trail_y.append(y2)
+        trail.set_data(trail_x, trail_y)
         
         # Move Truck Marker
         self.truck_marker.set_data([x2], [y2]) # Move to next node
@@ -134,4 +160,5 @@ class MapView(tk.Frame):
         self.canvas.draw_idle()
 
         # Speed of animation
-        self.root.after(100, self._animate_segment, path_nodes, index + 1, graph, on_animation_complete)
+        self.root.after(100, self._animate_segment, path_nodes, index + 1, graph, on_animation_complete,
+                        trail, trail_x, trail_y)
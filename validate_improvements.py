@@ -16,28 +16,29 @@ def validate_astar():
         from src.ai.astar import AStarNavigator
         import networkx as nx
         
-        # Verificar se _heuristic calcula distância euclidiana
-        source = inspect.getsource(AStarNavigator._heuristic)
+        # Verificar se a heurística usa distância euclidiana sobre as coordenadas
+        source = inspect.getsource(AStarNavigator._node_coordinates)
+        path_source = inspect.getsource(AStarNavigator.get_path)
         
         checks = {
-            "✅ Calcula distância euclidiana": "math.sqrt" in source or "**" in source,
+            "✅ Calcula distância euclidiana": "math.sqrt" in path_source or "math.hypot" in path_source,
             "✅ Usa coordenadas dos nós": "'x'" in source or "'y'" in source,
             "✅ Tem tratamento de erros": "try:" in source,
-            "✅ Retorna float": "-> float" in source or "return" in source
+            "✅ Retorna coordenadas": "return" in source
         }
         
         for check, passed in checks.items():
             print(f"  {check if passed else '❌ ' + check[2:]}")
         
         # Verificar se get_path usa heurística
-        path_source = inspect.getsource(AStarNavigator.get_path)
-        has_heuristic = "heuristic=self._heuristic" in path_source
-        print(f"  {'✅' if has_heuristic else '❌'} nx.astar_path usa heurística")
+        has_heuristic = "hypot(" in path_source and "self._xs" in path_source
+        print(f"  {'✅' if has_heuristic else '❌'} Busca A* usa heurística")
         
         # Verificar otimização de get_path_cost
         cost_source = inspect.getsource(AStarNavigator.get_path_cost)
-        optimized = "shortest_path_length" in cost_source
-        print(f"  {'✅' if optimized else '❌'} get_path_cost otimizado (usa shortest_path_length)")
+        tree_source = inspect.getsource(AStarNavigator._get_shortest_path_tree)
+        optimized = "_get_shortest_path_tree(" in cost_source and "dijkstra(" in tree_source
+        print(f"  {'✅' if optimized else '❌'} get_path_cost otimizado (usa Dijkstra compilado do SciPy)")
         
         return all(checks.values()) and has_heuristic and optimized
         
@@ -54,14 +55,14 @@ def validate_genetic():
         from src.ai.genetic import GeneticTSP
         
         # Verificar integração Fuzzy na fitness
-        source = inspect.getsource(GeneticTSP._calculate_fitness)
+        source = inspect.getsource(GeneticTSP._population_fitness)
         
         checks = {
             "✅ Calcula current_time": "current_time" in source,
             "✅ Usa fuzzy_priority": "fuzzy_priority" in source or "priority" in source,
             "✅ Aplica penalidade temporal": "time_penalty" in source or "penalty" in source,
             "✅ Tem docstring explicativa": '"""' in source or "'''" in source,
-            "✅ Type hints presentes": "-> float" in source
+            "✅ Type hints presentes": "-> np.ndarray" in source
         }
         
         for check, passed in checks.items():
@@ -93,10 +94,10 @@ def validate_main():
             content = f.read()
         
         checks = {
-            "✅ Import threading": "import threading" in content,
+            "✅ Import ThreadPoolExecutor": "from concurrent.futures import ThreadPoolExecutor" in content,
             "✅ Método _run_comparison_thread": "def _run_comparison_thread" in content,
             "✅ Método _optimize_thread": "def _optimize_thread" in content,
-            "✅ Thread.start() usado": "thread.start()" in content,
+            "✅ Executor.submit() usado": "self._executor.submit(" in content,
             "✅ root.after() para UI": "self.root.after(0" in content,
             "✅ Callback de progresso passado ao GA": "progress_callback=" in content
         }